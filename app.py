@@ -37,8 +37,11 @@ frame_count = 0
 detection_count = 0
 last_frame = None
 last_annotated_frame = None
+last_jpeg = None  # last_annotated_frame encoded once for all stream clients
 processing = False
 start_time = None
+stop_event = threading.Event()
+frame_ready = threading.Condition()  # Notified when a new annotated frame is available
 
 def initialize():
     """Initialize the camera and detector."""
@@ -69,7 +72,7 @@ def cleanup():
 def process_frames():
     """Process frames from the camera in a loop."""
     global camera, detector, frame_count, detection_count
-    global last_frame, last_annotated_frame, processing
+    global last_frame, last_annotated_frame, last_jpeg, processing
     
     logger.info("Starting frame processing loop (ultra efficiency)")
     processing = True
@@ -79,13 +82,13 @@ def process_frames():
             # Check if camera and detector are available
             if camera is None or detector is None:
                 logger.error("Camera or detector not initialized")
-                time.sleep(5.0)  # Very long sleep for ultra efficiency
+                stop_event.wait(5.0)  # Very long sleep for ultra efficiency
                 continue
             
             # Get a frame from the camera
             frame = camera.get_frame()
             if frame is None:
-                time.sleep(1.0)  # Moderate sleep when no frame
+                stop_event.wait(1.0)  # Moderate sleep when no frame
                 continue
             
             # Get motion detection status
@@ -94,40 +97,45 @@ def process_frames():
             # Run detection only when motion is detected
             detections, annotated_frame = detector.detect(frame, motion_detected)
             
-            # Update global variables
-            frame_count += 1
-            detection_count += len(detections)
-            last_frame = frame
-            last_annotated_frame = annotated_frame
+            # Encode once here rather than once per stream client
+            ret, jpeg = cv2.imencode('.jpg', annotated_frame)
+            if not ret:
+                logger.error("Failed to encode frame to JPEG")
+            
+            # Update global variables and wake the stream generators
+            with frame_ready:
+                frame_count += 1
+                detection_count += len(detections)
+                last_frame = frame
+                last_annotated_frame = annotated_frame
+                if ret:
+                    last_jpeg = jpeg.tobytes()
+                frame_ready.notify_all()
             
             # Sleep moderately to reduce CPU usage while maintaining responsiveness
-            time.sleep(1.0)
+            stop_event.wait(1.0)
             
         except Exception as e:
             logger.error(f"Error processing frame: {e}")
-            time.sleep(5.0)  # Very long sleep on error
+            stop_event.wait(5.0)  # Very long sleep on error
     
     logger.info("Frame processing loop stopped")
 
 def generate_frames():
     """Generate frames for the MJPEG stream."""
-    global last_annotated_frame
+    global last_jpeg
     
+    sent_frame_count = None
     while True:
         try:
-            # Wait for a frame to be available
-            if last_annotated_frame is None:
-                time.sleep(0.1)
-                continue
-            
-            # Convert to JPEG
-            ret, jpeg = cv2.imencode('.jpg', last_annotated_frame)
-            if not ret:
-                logger.error("Failed to encode frame to JPEG")
-                time.sleep(0.1)
-                continue
-                
-            frame_bytes = jpeg.tobytes()
+            # Wait until the processing thread publishes a frame we have not sent
+            with frame_ready:
+                if not frame_ready.wait_for(
+                        lambda: last_jpeg is not None and frame_count != sent_frame_count,
+                        timeout=5.0):
+                    continue
+                frame_bytes = last_jpeg
+                sent_frame_count = frame_count
             
             # Yield the frame in MJPEG format
             yield (b'--frame\r\n'
@@ -171,8 +179,8 @@ def start_app():
     
     # Start the frame processing thread
     start_time = time.time()
-    processing_thread = threading.Thread(target=process_frames)
-    processing_thread.daemon = True
+    stop_event.clear()
+    processing_thread = threading.Thread(target=process_frames, daemon=True)
     processing_thread.start()
     
     try:
@@ -187,6 +195,8 @@ def start_app():
         # Clean up
         global processing
         processing = False
+        stop_event.set()
+        processing_thread.join(timeout=2.0)
         cleanup()
     
     return True
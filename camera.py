@@ -17,6 +17,13 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# OpenCV rotation codes for the supported CAMERA_ROTATION values
+ROTATE_CODES = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_COUNTERCLOCKWISE,
+}
+
 class Camera:
     """Simple camera interface using libcamera-vid subprocess for Raspberry Pi Camera Module v2.
     Optimized for maximum efficiency on Pi Zero 2 W."""
@@ -26,10 +33,12 @@ class Camera:
         self.resolution = config.CAMERA_RESOLUTION
         self.framerate = config.CAMERA_FRAMERATE
         self.rotation = config.CAMERA_ROTATION
+        self.rotate_code = ROTATE_CODES.get(self.rotation)  # None means no rotation
         self.frame = None
         self.last_frame_time = 0
         self.running = False
         self.lock = threading.Lock()
+        self.stop_event = threading.Event()
         self.process = None
         self.motion_detected = False
         self.last_frame_gray = None
@@ -61,14 +70,15 @@ class Camera:
         self._cleanup_existing_processes()
         
         self.running = True
-        self.thread = threading.Thread(target=self._capture_loop)
-        self.thread.daemon = True
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
         self.thread.start()
         logger.info("Camera started")
     
     def stop(self):
         """Stop the camera capture thread."""
         self.running = False
+        self.stop_event.set()  # Wake the capture loop if it is waiting to retry
         
         # Stop the libcamera-vid process
         if self.process:
@@ -106,7 +116,8 @@ class Camera:
         frame_diff = cv2.absdiff(current_gray, self.last_frame_gray)
         
         # Count pixels that changed significantly
-        changed_pixels = np.sum(frame_diff > 30)
+        _, changed_mask = cv2.threshold(frame_diff, 30, 255, cv2.THRESH_BINARY)
+        changed_pixels = cv2.countNonZero(changed_mask)
         
         # Update last frame
         self.last_frame_gray = current_gray
@@ -153,7 +164,8 @@ class Camera:
             time.sleep(0.5)  # Minimal warm-up time
             
             # Read frames from the stream with ultra efficiency buffer management
-            frame_buffer = b''
+            frame_buffer = bytearray()
+            scan_pos = 0  # Buffer offset already searched for an end-of-image marker
             frame_count = 0
             skip_frames = 0  # Frame skipping counter
             
@@ -163,20 +175,25 @@ class Camera:
                     chunk = self.process.stdout.read(256)  # Minimal chunks
                     if not chunk:
                         logger.warning("No data received from libcamera-vid")
-                        time.sleep(2)  # Wait longer before retry
+                        self.stop_event.wait(2)  # Wait longer before retry
                         continue
                     
                     frame_buffer += chunk
                     
-                    # Look for JPEG frame boundaries
-                    while b'\xff\xd8' in frame_buffer and b'\xff\xd9' in frame_buffer:
+                    # Look for JPEG frame boundaries, resuming the end-marker
+                    # search where the previous chunk left off
+                    while True:
                         start = frame_buffer.find(b'\xff\xd8')
-                        end = frame_buffer.find(b'\xff\xd9', start) + 2
+                        if start < 0:
+                            break
+                        end = frame_buffer.find(b'\xff\xd9', max(start + 2, scan_pos))
                         
-                        if end > start:
+                        if end >= 0:
                             # Extract complete JPEG frame
+                            end += 2
                             jpeg_data = frame_buffer[start:end]
-                            frame_buffer = frame_buffer[end:]
+                            del frame_buffer[:end]
+                            scan_pos = 0
                             
                             # Process most frames for better responsiveness (skip every 2nd frame)
                             skip_frames += 1
@@ -191,20 +208,18 @@ class Camera:
                                 frame_count += 1
                                 
                                 # Apply rotation if needed
-                                if self.rotation == 90:
-                                    frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
-                                elif self.rotation == 180:
-                                    frame = cv2.rotate(frame, cv2.ROTATE_180)
-                                elif self.rotation == 270:
-                                    frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
+                                if self.rotate_code is not None:
+                                    frame = cv2.rotate(frame, self.rotate_code)
                                 
                                 # Detect motion (every 3rd frame for better responsiveness)
                                 if frame_count % 3 == 0:
                                     motion = self._detect_motion(frame)
                                     self.motion_detected = motion
                                 
+                                # The decoded frame is never modified afterwards,
+                                # so publish it without copying
                                 with self.lock:
-                                    self.frame = frame.copy()
+                                    self.frame = frame
                                     self.last_frame_time = time.time()
                                 
                                 # Log motion detection occasionally
@@ -214,11 +229,14 @@ class Camera:
                             else:
                                 logger.warning("Failed to decode JPEG frame")
                         else:
+                            # Frame incomplete; keep the last byte searchable in
+                            # case the marker is split across chunks
+                            scan_pos = len(frame_buffer) - 1
                             break
                             
                 except Exception as e:
                     logger.error(f"Error reading from libcamera-vid: {e}")
-                    time.sleep(2)  # Wait before retry
+                    self.stop_event.wait(2)  # Wait before retry
                     
         except Exception as e:
             logger.error(f"Error in camera capture loop: {e}")
@@ -238,7 +256,10 @@ class Camera:
     
     def get_jpeg(self, quality=70):
         """Get the latest frame as JPEG bytes with optimized quality."""
-        frame = self.get_frame()
+        # Frames are replaced rather than modified in place, so encoding
+        # the shared frame directly is safe and avoids a copy
+        with self.lock:
+            frame = self.frame
         if frame is None:
             return None
         # Convert to JPEG with optimized quality
@@ -17,6 +17,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# COCO class ID reported by the detection model for cats
+CAT_CLASS_ID = 16
+
 class TFLiteDetector:
     """TensorFlow Lite cat detector using INT8 quantized model.
     Optimized for maximum efficiency on Pi Zero 2 W."""
@@ -42,7 +45,7 @@ class TFLiteDetector:
             18: "horse", 19: "sheep", 20: "cow", 21: "elephant", 22: "bear", 23: "zebra",
             24: "giraffe", 25: "backpack", 26: "umbrella", 27: "handbag", 28: "tie", 29: "suitcase"
         }
-        self.last_detection_time = 0
+        self.last_detection_time = float('-inf')
         self.detection_interval = config.DETECTION_INTERVAL
         
         # Validate model file exists
@@ -63,6 +66,12 @@ class TFLiteDetector:
             self.input_w = io["shape"][2]
             self.input_t = io["dtype"]
             
+            # Preallocate preprocessing buffers reused on every inference
+            self._resized = np.empty((self.input_h, self.input_w, 3), dtype=np.uint8)
+            self._rgb = np.empty((1, self.input_h, self.input_w, 3), dtype=np.uint8)
+            if self.input_t == np.int8:
+                self._shifted = np.empty_like(self._rgb)
+            
             # Handle quantization parameters
             if "quantization" in io:
                 self.scale, self.zero_point = io["quantization"]
@@ -105,26 +114,29 @@ class TFLiteDetector:
             return [], frame
         
         # Skip detection if it's too soon since the last one
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_detection_time < self.detection_interval:
             return [], frame
         
         self.last_detection_time = current_time
         
         try:
-            # Preprocess image
-            img = cv2.resize(frame, (self.input_w, self.input_h))
-            rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            # Preprocess image into the preallocated buffers
+            # (the RGB buffer already carries the batch dimension)
+            cv2.resize(frame, (self.input_w, self.input_h), dst=self._resized)
+            cv2.cvtColor(self._resized, cv2.COLOR_BGR2RGB, dst=self._rgb[0])
+            rgb = self._rgb
             
-            # Apply quantization if needed
-            if self.scale != 1.0 or self.zero_point != 0:
-                inp = (rgb / self.scale + self.zero_point).astype(self.input_t)
+            # Quantized image models take raw pixels (their input quantization
+            # maps 0-255 onto the normalized range), so skip any float math
+            if self.input_t == np.uint8:
+                inp = rgb
+            elif self.input_t == np.int8:
+                # XOR with 0x80 reinterpreted as int8 is (pixel - 128)
+                inp = np.bitwise_xor(rgb, 0x80, out=self._shifted).view(np.int8)
             else:
                 inp = rgb.astype(self.input_t)
             
-            # Add batch dimension
-            inp = inp[None, ...]
-            
             # Run inference
             self.interp.set_tensor(self.in_idx, inp)
             self.interp.invoke()
@@ -139,20 +151,18 @@ class TFLiteDetector:
             h, w, _ = frame.shape
             detections = []
             annotated_frame = frame.copy()
-            
-            for i in range(count):
-                if scores[i] < self.score_thresh:
-                    continue
-                
-                # Convert normalized coordinates to pixel coordinates
-                ymin, xmin, ymax, xmax = boxes[i]
-                x1, y1 = int(xmin * w), int(ymin * h)
-                x2, y2 = int(xmax * w), int(ymax * h)
-                
-                # Ensure coordinates are within frame bounds
-                x1, y1 = max(0, x1), max(0, y1)
-                x2, y2 = min(w, x2), min(h, y2)
-                
+
+            # Keep confident cat detections and convert all normalized
+            # (ymin, xmin, ymax, xmax) boxes to pixel coordinates in one pass
+            keep = np.flatnonzero((scores[:count] >= self.score_thresh) &
+                                  (classes[:count] == CAT_CLASS_ID))
+            frame_dims = np.array([h, w, h, w], dtype=np.float32)
+            corners = (boxes[keep] * frame_dims).astype(np.int32)
+
+            # Ensure coordinates are within frame bounds
+            np.clip(corners, 0, frame_dims.astype(np.int32), out=corners)
+
+            for i, (y1, x1, y2, x2) in zip(keep, corners.tolist()):
                 detections.append((x1, y1, x2 - x1, y2 - y1))
                 
                 # Draw detection box and label